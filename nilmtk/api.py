@@ -229,12 +229,12 @@ class API():
             for building in d[dataset]['buildings']:
                 print("Loading building ... ",building)
                 train.set_window(start=d[dataset]['buildings'][building]['start_time'],end=d[dataset]['buildings'][building]['end_time'])
-                train_df = next(train.buildings[building].elec.mains().load(physical_quantity='power', ac_type=self.power['mains'], sample_period=self.sample_period))
+                train_df = _load_all_chunks(train.buildings[building].elec.mains(), physical_quantity='power', ac_type=self.power['mains'], sample_period=self.sample_period)
                 train_df = train_df[[list(train_df.columns)[0]]]
                 appliance_readings = []
                 
                 for appliance_name in self.appliances:
-                    appliance_df = next(train.buildings[building].elec[appliance_name].load(physical_quantity='power', ac_type=self.power['appliance'], sample_period=self.sample_period))
+                    appliance_df = _load_all_chunks(train.buildings[building].elec[appliance_name], physical_quantity='power', ac_type=self.power['appliance'], sample_period=self.sample_period)
                     appliance_df = appliance_df[[list(appliance_df.columns)[0]]]
                     appliance_readings.append(appliance_df)
 
@@ -268,11 +268,11 @@ class API():
             test=DataSet(d[dataset]['path'])
             for building in d[dataset]['buildings']:
                 test.set_window(start=d[dataset]['buildings'][building]['start_time'],end=d[dataset]['buildings'][building]['end_time'])
-                test_mains=next(test.buildings[building].elec.mains().load(physical_quantity='power', ac_type=self.power['mains'], sample_period=self.sample_period))
+                test_mains=_load_all_chunks(test.buildings[building].elec.mains(), physical_quantity='power', ac_type=self.power['mains'], sample_period=self.sample_period)
                 appliance_readings=[]
 
                 for appliance in self.appliances:
-                    test_df=next((test.buildings[building].elec[appliance].load(physical_quantity='power', ac_type=self.power['appliance'], sample_period=self.sample_period)))
+                    test_df=_load_all_chunks(test.buildings[building].elec[appliance], physical_quantity='power', ac_type=self.power['appliance'], sample_period=self.sample_period)
                     appliance_readings.append(test_df)
 
                 
@@ -422,3 +422,20 @@ class API():
         for app_name in gt.columns:
             error[app_name] = loss_function(gt[app_name],clf_pred[app_name])
         return pd.Series(error)        
+
+
+def _load_all_chunks(elec, **load_kwargs):
+    """Loads every chunk of `elec` into a single DataFrame.
+
+    Consecutive chunks from `DataStore.load` share a row, so the first
+    row of a chunk is dropped if it repeats the end of the previous one.
+    """
+    chunks = []
+    prev_end = None
+    for chunk in elec.load(**load_kwargs):
+        if prev_end is not None and len(chunk) and chunk.index[0] <= prev_end:
+            chunk = chunk.iloc[1:]
+        if len(chunk):
+            prev_end = chunk.index[-1]
+        chunks.append(chunk)
+    return pd.concat(chunks)
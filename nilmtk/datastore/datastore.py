@@ -4,6 +4,9 @@ from io import open
 
 MAX_MEM_ALLOWANCE_IN_BYTES = 2**28
 
+# Lower bound on the automatically chosen chunksize
+MIN_CHUNKSIZE = 10000
+
 
 class DataStore(object):
     """
@@ -82,6 +85,11 @@ class DataStore(object):
             property which will be a DataFrame of length `n_look_ahead_rows`
             of the data immediately in front of the data in the main DataFrame.
         chunksize : int, optional
+            Maximum number of rows per chunk.  The default loads each
+            section as a single chunk in practice; many callers rely on
+            that.  HDFDataStore also accepts None, which picks a
+            chunksize from the width of the table and
+            MAX_MEM_ALLOWANCE_IN_BYTES (see `rows_per_chunk`).
 
         Returns
         ------- 
@@ -187,6 +195,13 @@ def write_yaml_to_file(metadata_filename, metadata):
     metadata_file.close()
 
 
+def rows_per_chunk(bytes_per_row):
+    """Returns the number of rows per chunk such that a chunk of
+    `bytes_per_row` uses about a quarter of MAX_MEM_ALLOWANCE_IN_BYTES,
+    leaving headroom for the copies Pandas makes while processing it."""
+    return max(MIN_CHUNKSIZE, MAX_MEM_ALLOWANCE_IN_BYTES // 4 // bytes_per_row)
+
+
 def join_key(*args):
     """
     Examples
@@ -200,14 +215,8 @@ def join_key(*args):
     >>> join_key('')
     '/'
     """
-    key = '/'
-    for arg in args:
-        arg_stripped = str(arg).strip('/')
-        if arg_stripped:
-            key += arg_stripped + '/'
-    if len(key) > 1:
-        key = key[:-1] # remove last trailing slash
-    return key
+    parts = [part for part in (str(arg).strip('/') for arg in args) if part]
+    return '/' + '/'.join(parts)
         
 def convert_datastore(input_store, output_store):
     """
@@ -1,5 +1,7 @@
-from copy import deepcopy
 from os.path import isfile
+import pickle
+import queue
+import threading
 import warnings
 
 import numpy as np
@@ -7,23 +9,56 @@ import pandas as pd
 
 from nilmtk.timeframe import TimeFrame
 from nilmtk.timeframegroup import TimeFrameGroup
-from .datastore import DataStore, MAX_MEM_ALLOWANCE_IN_BYTES
+from .datastore import DataStore, MAX_MEM_ALLOWANCE_IN_BYTES, rows_per_chunk
 from nilmtk.docinherit import doc_inherit
 
+
 class HDFDataStore(DataStore):
 
-    @doc_inherit
-    def __init__(self, filename, mode='a'):
+    def __init__(self, filename, mode='a', metadata_cache_mb=16):
+        """
+        Parameters
+        ----------
+        filename : string
+        mode : {'a', 'w', 'r', 'r+'}, optional
+        metadata_cache_mb : int or float, optional
+            Size of the HDF5 metadata cache.  NILMTK makes many small
+            metadata reads (node attributes, table headers, index
+            B-trees) when walking buildings and meters; a larger cache
+            keeps them in memory instead of going back to disk.
+        """
         if mode == 'a' and not isfile(filename):
             raise IOError("No such file as " + filename)
 
+        # Extra parameters passed through to `tables.open_file`
+        self._open_kwargs = {
+            'metadata_cache_size': int(metadata_cache_mb * 2**20)}
+
         with warnings.catch_warnings():
             # Silence pytables warnings with numpy, out of our control
             warnings.filterwarnings('ignore', category=RuntimeWarning, message='.*numpy.ufunc size changed.*')
 
-            self.store = pd.HDFStore(filename, mode, complevel=9, complib='blosc')
+            self.store = pd.HDFStore(filename, mode, complevel=9, complib='blosc',
+                                     **self._open_kwargs)
             super(HDFDataStore, self).__init__()
 
+        # Caches of table metadata, cleared whenever the store is modified.
+        self._keys_cache = None
+        self._storer_cache = {}
+        self._cols_cache = {}
+        self._layout_cache = {}
+        self._metadata_cache = {}
+        self._timeframe_cache = {}
+        self._children_cache = None
+        self._buf_pool = {}
+        self._itemsizes_cache = {}
+
+        # Number of open() calls (counting the constructor) not yet
+        # matched by a close()
+        self._refcount = 1
+        # Mode the store is currently open in
+        self._mode = mode
+
     @doc_inherit
     def __getitem__(self, key):
         return self.store[key]
@@ -31,17 +66,7 @@ class HDFDataStore(DataStore):
     @doc_inherit
     def load(self, key, columns=None, sections=None, n_look_ahead_rows=0,
              chunksize=MAX_MEM_ALLOWANCE_IN_BYTES, verbose=False):
-        # TODO: calculate chunksize default based on physical
-        # memory installed and number of columns
-
-        # Make sure key has a slash at the front but not at the end.
-        if key[0] != '/':
-            key = '/' + key
-        if len(key) > 1 and key[-1] == '/':
-            key = key[:-1]
-
-        # Make sure chunksize is an int otherwise `range` complains later.
-        chunksize = np.int64(chunksize)
+        key = _normalise_key(key)
 
         # Set `sections` variable
         sections = [TimeFrame()] if sections is None else sections
@@ -52,6 +77,12 @@ class HDFDataStore(DataStore):
             columns = [('' if pq is None else pq, '' if ac is None else ac)
                     for pq, ac in columns]
 
+        if chunksize is None:
+            chunksize = self._default_chunksize(key, columns)
+
+        # Make sure chunksize is an int otherwise `range` complains later.
+        chunksize = np.int64(chunksize)
+
         if verbose:
             print("HDFDataStore.load(key='{}', columns='{}', sections='{}',"
                   " n_look_ahead_rows='{}', chunksize='{}')"
@@ -59,93 +90,163 @@ class HDFDataStore(DataStore):
 
         self.all_sections_smaller_than_chunksize = True
 
-        for section in sections:
-            if verbose:
-                print("   ", section)
-            window_intersect = self.window.intersection(section)
-
-            if window_intersect.empty:
-                data = pd.DataFrame()
-                data.timeframe = section
-                yield data
-                continue
-
-            terms = window_intersect.query_terms('window_intersect')
-            if terms is None:
-                section_start_i = 0
-                section_end_i = self.store.get_storer(key).nrows
-                if section_end_i <= 1:
+        # If the window is unbounded then intersecting it with each
+        # section is a no-op, so skip building a new TimeFrame per section.
+        window = self.window
+        window_is_universal = (not window.empty and window.start is None
+                               and window.end is None)
+
+        try:
+            for section in sections:
+                if verbose:
+                    print("   ", section)
+                if window_is_universal:
+                    window_intersect = section
+                else:
+                    window_intersect = window.intersection(section)
+
+                if window_intersect.empty:
                     data = pd.DataFrame()
                     data.timeframe = section
                     yield data
                     continue
-            else:
-                try:
-                    coords = self.store.select_as_coordinates(key=key, where=terms)
-                except AttributeError as e:
-                    if str(e) == ("'NoneType' object has no attribute "
-                                  "'read_coordinates'"):
-                        raise KeyError("key '{}' not found".format(key))
-                    else:
-                        raise
-                n_coords = len(coords)
-                if n_coords == 0:
-                    data = pd.DataFrame()
-                    data.timeframe = window_intersect
-                    yield data
-                    continue
 
-                section_start_i = coords[0]
-                section_end_i   = coords[-1]
-                del coords
-
-            slice_starts = range(section_start_i, section_end_i, chunksize)
-            n_chunks = int(np.ceil((section_end_i - section_start_i) / chunksize))
-
-            if n_chunks > 1:
-                self.all_sections_smaller_than_chunksize = False
-
-            for chunk_i, chunk_start_i in enumerate(slice_starts):
-                chunk_end_i = chunk_start_i + chunksize
-                there_are_more_subchunks = (chunk_i < n_chunks-1)
-
-                if chunk_end_i > section_end_i:
-                    chunk_end_i = section_end_i
-                chunk_end_i += 1
-
-                data = self.store.select(key=key, columns=columns,
-                                         start=chunk_start_i, stop=chunk_end_i)
-
-                # if len(data) <= 2:
-                #     yield pd.DataFrame()
-
-                # Load look ahead if necessary
-                if n_look_ahead_rows > 0:
-                    if len(data.index) > 0:
-                        look_ahead_start_i = chunk_end_i
-                        look_ahead_end_i = look_ahead_start_i + n_look_ahead_rows
-                        try:
-                            look_ahead = self.store.select(
-                                key=key, columns=columns,
-                                start=look_ahead_start_i,
-                                stop=look_ahead_end_i
-                            )
-                        except ValueError:
+                terms = window_intersect.query_terms('window_intersect')
+                if terms is None:
+                    section_start_i = 0
+                    section_end_i = self._get_storer(key).nrows
+                    if section_end_i <= 1:
+                        data = pd.DataFrame()
+                        data.timeframe = section
+                        yield data
+                        continue
+                else:
+                    section_start_i, end_i = self._row_range(
+                        key, window_intersect)
+                    if end_i <= section_start_i:
+                        data = pd.DataFrame()
+                        data.timeframe = window_intersect
+                        yield data
+                        continue
+
+                    # The last row of the section, inclusive
+                    section_end_i = end_i - 1
+
+                slice_starts = range(section_start_i, section_end_i, chunksize)
+                n_chunks = int(np.ceil((section_end_i - section_start_i) / chunksize))
+
+                if n_chunks > 1:
+                    self.all_sections_smaller_than_chunksize = False
+
+                for chunk_i, chunk_start_i in enumerate(slice_starts):
+                    chunk_end_i = chunk_start_i + chunksize
+                    there_are_more_subchunks = (chunk_i < n_chunks-1)
+
+                    if chunk_end_i > section_end_i:
+                        chunk_end_i = section_end_i
+                    chunk_end_i += 1
+
+                    # Load look ahead if necessary.  The look ahead rows sit
+                    # immediately after the chunk on disk so we fetch them in
+                    # the same query and split them off, rather than issuing
+                    # a second select per chunk.
+                    if n_look_ahead_rows > 0:
+                        data = self._select(
+                            key, columns, start=chunk_start_i,
+                            stop=chunk_end_i + n_look_ahead_rows)
+                        n_rows = len(data)
+                        n_chunk_rows = chunk_end_i - chunk_start_i
+                        if n_rows > 0:
+                            look_ahead = data.iloc[n_chunk_rows:]
+                        else:
                             look_ahead = pd.DataFrame()
+                        # At the end of the table there may be no look ahead
+                        # rows to split off
+                        if n_rows > n_chunk_rows:
+                            data = data.iloc[:n_chunk_rows]
+
+                        # Bypass DataFrame.__setattr__, which would warn that
+                        # "Pandas doesn't allow columns to be created via a new
+                        # attribute name"; we're not adding a column.  This is
+                        # cheaper than a catch_warnings block per chunk.
+                        object.__setattr__(data, 'look_ahead', look_ahead)
                     else:
-                        look_ahead = pd.DataFrame()
-                            
-                    with warnings.catch_warnings():
-                        # Silence "Pandas doesn't allow columns to be created via a new attribute name" 
-                        # since we're not adding a column
-                        warnings.filterwarnings('ignore', category=UserWarning, message=".*Pandas doesn't allow columns.*")
-                        setattr(data, 'look_ahead', look_ahead)
-
-                data.timeframe = _timeframe_for_chunk(there_are_more_subchunks, 
-                                                      chunk_i, window_intersect,
-                                                      data.index)
-                yield data
-                del data
+                        data = self._select(key, columns, start=chunk_start_i,
+                                            stop=chunk_end_i)
+
+                    data.timeframe = _timeframe_for_chunk(there_are_more_subchunks, 
+                                                          chunk_i, window_intersect,
+                                                          data.index)
+                    yield data
+                    del data
+        finally:
+            # Don't hold on to the staging buffer once loading is over
+            self._buf_pool = {}
+
+    def load_many(self, keys, prefetch=2, **load_kwargs):
+        """Loads several tables, reading ahead in a background thread.
+
+        Parameters
+        ----------
+        keys : list of strings
+        prefetch : int, optional
+            Maximum number of chunks to read ahead of the caller.
+        **load_kwargs : any other key word arguments to pass to `self.load()`
+            for every key.
+
+        Returns
+        -------
+        generator of (key, DataFrame) tuples
+            The chunks of each key in turn, exactly as `load` yields them.
+
+        Notes
+        -----
+        HDF5 is not thread-safe, so all tables are read one chunk at a time
+        by a single thread.  The gain is that reading the next chunk
+        overlaps with whatever the caller does with the current one.
+        Do not use this HDFDataStore for anything else until the generator
+        is exhausted or closed.
+        """
+        chunks = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            # Give up if the consumer has gone away, rather than blocking
+            # forever on a full queue.
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read_ahead():
+            try:
+                for key in keys:
+                    for chunk in self.load(key, **load_kwargs):
+                        if not put((key, chunk)):
+                            return
+            except Exception as e:
+                # Re-raised in the consumer's thread
+                put((None, e))
+            else:
+                put(None)
+
+        thread = threading.Thread(target=read_ahead, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    break
+                key, chunk = item
+                if key is None:
+                    raise chunk
+                yield key, chunk
+        finally:
+            stop.set()
+            thread.join()
 
     @doc_inherit
     def append(self, key, value):
@@ -161,11 +262,13 @@ class HDFDataStore(DataStore):
         Append does *not* check if data being appended overlaps with existing
         data in the table, so be careful.
         """
+        self._clear_cache()
         self.store.append(key=key, value=value)
         self.store.flush()
 
     @doc_inherit
     def put(self, key, value):
+        self._clear_cache()
         self.store.put(key, value, format='table', 
                        expectedrows=len(value), index=False)
         self.store.create_table_index(key, columns=['index'], 
@@ -174,17 +277,25 @@ class HDFDataStore(DataStore):
 
     @doc_inherit
     def remove(self, key):
+        self._clear_cache()
         self.store.remove(key)
 
     @doc_inherit
     def load_metadata(self, key='/'):
-        if key == '/':
-            node = self.store.root
-        else:
-            node = self.store.get_node(key)
-
-        metadata = deepcopy(node._v_attrs.metadata)
-        return metadata
+        # Callers are free to modify the returned dict so each call must
+        # get its own copy.  Unpickling a cached snapshot is much cheaper
+        # than deepcopy-ing the nested metadata every time.
+        try:
+            snapshot = self._metadata_cache[key]
+        except KeyError:
+            if key == '/':
+                node = self.store.root
+            else:
+                node = self.store.get_node(key)
+            snapshot = pickle.dumps(node._v_attrs.metadata,
+                                    pickle.HIGHEST_PROTOCOL)
+            self._metadata_cache[key] = snapshot
+        return pickle.loads(snapshot)
 
     @doc_inherit
     def save_metadata(self, key, metadata):
@@ -194,23 +305,49 @@ class HDFDataStore(DataStore):
             node = self.store.get_node(key)
 
         node._v_attrs.metadata = metadata
+        self._metadata_cache = {}
+        self._children_cache = None
         self.store.flush()
 
     @doc_inherit
     def elements_below_key(self, key='/'):
-        if key == '/' or not key:
-            node = self.store.root
-        else:
-            node = self.store.get_node(key)
-        return list(node._v_children.keys())
+        # Walk the whole group tree once rather than looking up the node
+        # on every call; callers enumerate buildings, utilities and meters
+        # one level at a time.
+        if self._children_cache is None:
+            self._children_cache = {
+                group._v_pathname: list(group._v_children.keys())
+                for group in self.store._handle.walk_groups('/')}
+        key = _normalise_key(key) if key else '/'
+        try:
+            return list(self._children_cache[key])
+        except KeyError:
+            raise KeyError(key + ' is not a group in the store')
 
     @doc_inherit
     def close(self):
-        self.store.close()
+        # Only close the file once every open() has been matched by a close()
+        self._refcount -= 1
+        if self._refcount <= 0:
+            self._refcount = 0
+            self.store.close()
+            self._clear_cache()
 
     @doc_inherit
     def open(self, mode='a'):
-        self.store.open(mode=mode)
+        is_open = self.store.is_open
+        if is_open and (_is_writable(self._mode) or not _is_writable(mode)):
+            # Never drop write access while the store is held elsewhere
+            self._refcount += 1
+            return
+
+        # Either the file is closed or the caller needs write access to a
+        # read-only file, so (re)open it.  Anything cached refers to the
+        # old file handle.
+        self._clear_cache()
+        self.store.open(mode=mode, **self._open_kwargs)
+        self._mode = mode
+        self._refcount = self._refcount + 1 if is_open else 1
         
     @doc_inherit
     def get_timeframe(self, key):
@@ -219,9 +356,27 @@ class HDFDataStore(DataStore):
         -------
         nilmtk.TimeFrame of entire table after intersecting with self.window.
         """
-        data_start_date = self.store.select(key, [0]).index[0]
-        data_end_date = self.store.select(key, start=-1).index[0]
-        timeframe = TimeFrame(data_start_date, data_end_date)
+        key = _normalise_key(key)
+        try:
+            timeframe = self._timeframe_cache[key]
+        except KeyError:
+            layout = self._get_layout(key, None)
+            if layout is None:
+                data_start_date = self.store.select(key, [0]).index[0]
+                data_end_date = self.store.select(key, start=-1).index[0]
+            else:
+                # Read just the first and last timestamps from the table
+                table = self._get_storer(key).table
+                nrows = table.nrows
+                first = table.read(start=0, stop=1, field='index')
+                last = table.read(start=nrows-1, stop=nrows, field='index')
+                template = layout[0]
+                data_start_date = _to_datetime_index(
+                    first, template.index.tz)[0]
+                data_end_date = _to_datetime_index(
+                    last, template.index.tz)[0]
+            timeframe = TimeFrame(data_start_date, data_end_date)
+            self._timeframe_cache[key] = timeframe
         return self.window.intersection(timeframe)
     
     def _check_columns(self, key, columns):
@@ -250,11 +405,151 @@ class HDFDataStore(DataStore):
         return query_cols.issubset(table_cols)
 
     def _column_names(self, key):
-        self._check_key(key)
-        storer = self._get_storer(key)
-        col_names = storer.non_index_axes[0][1:][0]
+        try:
+            col_names = self._cols_cache[key]
+        except KeyError:
+            storer = self._get_storer(key)
+            col_names = storer.non_index_axes[0][1:][0]
+            self._cols_cache[key] = col_names
         return col_names
 
+    def _select(self, key, columns, start, stop):
+        """Loads rows [start, stop) of `key`.
+
+        Reads the PyTables table directly and builds the DataFrame from
+        the raw column blocks, skipping the per-query reconstruction done
+        by `HDFStore.select`.  Falls back to `HDFStore.select` for tables
+        whose layout `_get_layout` cannot map.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        layout = self._get_layout(key, columns)
+        if layout is None:
+            return self.store.select(key=key, columns=columns,
+                                     start=start, stop=stop)
+
+        template, fields = layout
+        table = self._get_storer(key).table
+        stop = min(stop, table.nrows)
+        if stop > start:
+            rows = self._get_read_buffer(table.dtype, stop - start)
+            table.read(start=start, stop=stop, out=rows)
+        else:
+            rows = table.read(start=start, stop=stop)
+
+        # `rows` is reused by the next read, so everything taken from it
+        # below must be a copy.
+        template_index = template.index
+        index = _to_datetime_index(rows['index'], template_index.tz,
+                                   template_index.freq, template_index.name)
+        if len(fields) == 1:
+            field, positions = fields[0]
+            data = pd.DataFrame(rows[field][:, positions], index=index,
+                                columns=template.columns)
+        else:
+            arrays = {}
+            for field, positions in fields:
+                block = rows[field]
+                for position in positions:
+                    arrays[len(arrays)] = block[:, position].copy()
+            data = pd.DataFrame(arrays, index=index)
+            data.columns = template.columns
+        return data
+
+    def _get_read_buffer(self, dtype, nrows):
+        """Returns a structured array of `nrows` rows of `dtype` for
+        PyTables to read into.  One buffer per row layout is kept and only
+        reallocated when a larger read comes along, so consecutive chunks
+        don't each allocate (and free) a chunk-sized staging array.
+        `load` empties the pool when it finishes."""
+        buf = self._buf_pool.get(dtype)
+        if buf is None or len(buf) < nrows:
+            buf = np.empty(nrows, dtype=dtype)
+            self._buf_pool[dtype] = buf
+        return buf[:nrows]
+
+    def _get_layout(self, key, columns):
+        """Maps the requested columns onto the blocks of the PyTables table.
+
+        Returns
+        -------
+        (template, fields) or None
+            `template` is an empty DataFrame as returned by
+            `HDFStore.select`, providing the column index and the timezone,
+            freq and name of the index.
+            `fields` is a list of (block name, list of column positions)
+            in the order of `template.columns`.  None if the table does
+            not have a plain datetime index and numeric value blocks
+            (e.g. if it has data columns).
+        """
+        cache_key = (key, None if columns is None else tuple(columns))
+        try:
+            return self._layout_cache[cache_key]
+        except KeyError:
+            pass
+
+        layout = None
+        storer = self._get_storer(key)
+        if storer.is_table and storer.infer_axes():
+            index_kind = _decode(storer.index_axes[0].kind)
+            value_blocks = {}
+            coldtypes = storer.table.coldtypes
+            for axis in storer.values_axes:
+                # Data columns are stored as scalar fields rather than
+                # 2-D blocks of values
+                if (_decode(axis.kind) not in ('float', 'integer') or
+                        axis.is_data_indexable or
+                        coldtypes[axis.cname].ndim == 0):
+                    break
+                for position, column in enumerate(axis.values):
+                    value_blocks[column] = (axis.cname, position)
+            else:
+                if (index_kind == 'datetime64' and
+                        len(storer.non_index_axes) == 1):
+                    template = self.store.select(key=key, columns=columns,
+                                                 start=0, stop=0)
+                    fields = []
+                    for column in template.columns:
+                        field, position = value_blocks[column]
+                        if fields and fields[-1][0] == field:
+                            fields[-1][1].append(position)
+                        else:
+                            fields.append((field, [position]))
+                    layout = (template, fields)
+
+        self._layout_cache[cache_key] = layout
+        return layout
+
+    def _default_chunksize(self, key, columns=None):
+        """Returns the number of rows per chunk of `columns`.
+        See `rows_per_chunk`."""
+        bytes_per_row = self._estimate_memory_requirement(key, 1, columns)
+        chunksize = rows_per_chunk(bytes_per_row)
+        # No point allocating for more rows than the table holds
+        return max(min(chunksize, self._get_storer(key).nrows), 1)
+
+    def _column_itemsizes(self, key):
+        """
+        Returns
+        -------
+        dict mapping each column name to the number of bytes per element
+        of its dtype on disk.
+        """
+        try:
+            itemsizes = self._itemsizes_cache[key]
+        except KeyError:
+            storer = self._get_storer(key)
+            coldtypes = storer.table.coldtypes
+            itemsizes = {}
+            for axis in storer.values_axes:
+                itemsize = coldtypes[axis.cname].base.itemsize
+                for column in axis.values:
+                    itemsizes[column] = itemsize
+            self._itemsizes_cache[key] = itemsizes
+        return itemsizes
+
     def _check_data_will_fit_in_memory(self, key, nrows, columns=None):
         # Check we won't use too much memory
         mem_requirement = self._estimate_memory_requirement(key, nrows, columns)
@@ -265,6 +560,7 @@ class HDFDataStore(DataStore):
 
     def _estimate_memory_requirement(self, key, nrows, columns=None, paranoid=False):
         """Returns estimated mem requirement in bytes."""
+        # Used for any column whose dtype is unknown
         BYTES_PER_ELEMENT = 4
         BYTES_PER_TIMESTAMP = 8
         if paranoid:
@@ -273,8 +569,10 @@ class HDFDataStore(DataStore):
             columns = self._column_names(key)
         elif paranoid:
             self._check_columns(key, columns)
-        ncols = len(columns)
-        est_mem_usage_for_data = nrows * ncols * BYTES_PER_ELEMENT
+        column_itemsizes = self._column_itemsizes(key)
+        bytes_per_row = sum(column_itemsizes.get(column, BYTES_PER_ELEMENT)
+                            for column in columns)
+        est_mem_usage_for_data = nrows * bytes_per_row
         est_mem_usage_for_index = nrows * BYTES_PER_TIMESTAMP
         if columns == ['index']:
             return est_mem_usage_for_index
@@ -291,22 +589,55 @@ class HDFDataStore(DataStore):
         if timeframe_intersect.empty:
             nrows = 0
         elif timeframe_intersect:
-            terms = timeframe_intersect.query_terms('timeframe_intersect')
-            coords = self.store.select_as_coordinates(key, terms)
-            nrows = len(coords)
+            start_i, end_i = self._row_range(key, timeframe_intersect)
+            nrows = max(end_i - start_i, 0)
         else:
             storer = self._get_storer(key)
             nrows = storer.nrows
         return nrows
     
+    def _row_range(self, key, timeframe):
+        """Returns the rows [start_i, end_i) of `key` that fall within
+        `timeframe`.  The index is sorted, so it is bisected on disk
+        rather than materialising the coordinates of every row."""
+        table = self._get_storer(key).table
+        if timeframe.start is None:
+            start_i = 0
+        else:
+            start_i = _bisect_index(table, timeframe.start.value)
+        if timeframe.end is None:
+            end_i = table.nrows
+        else:
+            side = 'right' if timeframe.include_end else 'left'
+            end_i = _bisect_index(table, timeframe.end.value, side)
+        return start_i, end_i
+
     def _keys(self):
-        return self.store.keys()
+        if self._keys_cache is None:
+            # Only used for membership tests, so keep it as a set
+            self._keys_cache = frozenset(self.store.keys())
+        return self._keys_cache
 
     def _get_storer(self, key):
-        self._check_key(key)
-        storer = self.store.get_storer(key)
-        assert storer is not None, "cannot get storer for key = " + key
+        try:
+            storer = self._storer_cache[key]
+        except KeyError:
+            self._check_key(key)
+            storer = self.store.get_storer(key)
+            assert storer is not None, "cannot get storer for key = " + key
+            self._storer_cache[key] = storer
         return storer
+
+    def _clear_cache(self):
+        self._keys_cache = None
+        self._storer_cache = {}
+        self._cols_cache = {}
+        self._layout_cache = {}
+        self._metadata_cache = {}
+        self._timeframe_cache = {}
+        self._children_cache = None
+        self._buf_pool = {}
+        self._itemsizes_cache = {}
     
     def _check_key(self, key):
         """
@@ -318,6 +649,67 @@ class HDFDataStore(DataStore):
             raise KeyError(key + ' not in store')
         
 
+def _is_writable(mode):
+    return mode != 'r'
+
+
+def _normalise_key(key):
+    """Makes sure key has a slash at the front but not at the end."""
+    if not key.startswith('/'):
+        key = '/' + key
+    if len(key) > 1 and key.endswith('/'):
+        key = key[:-1]
+    return key
+
+
+def _bisect_index(table, value, side='left'):
+    """Finds the row at which `value` would be inserted into the sorted
+    'index' column of a PyTables `table`, reading one row per step.
+
+    Parameters
+    ----------
+    table : tables.Table
+    value : int, nanoseconds since the epoch (UTC for tz-aware indexes)
+    side : {'left', 'right'}, as for `numpy.searchsorted`
+
+    Returns
+    -------
+    int
+    """
+    lo = 0
+    hi = table.nrows
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_value = table.read(start=mid, stop=mid+1, field='index')[0]
+        if mid_value < value or (side == 'right' and mid_value == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _to_datetime_index(values, tz=None, freq=None, name=None):
+    """Converts int64 nanoseconds, as stored in the 'index' column of a
+    Pandas table, to a DatetimeIndex.  Tz-aware indexes are stored in UTC.
+    As in `HDFStore.select`, `freq` is dropped if `values` don't conform
+    to it.  The returned index never shares memory with `values`."""
+    values = values.astype('datetime64[ns]')
+    try:
+        index = pd.DatetimeIndex(values, freq=freq, name=name)
+    except ValueError:
+        index = pd.DatetimeIndex(values, name=name)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return index
+
+
+def _decode(kind):
+    # Tables written under Python 2 store the column kinds as bytes
+    if isinstance(kind, bytes):
+        kind = kind.decode()
+    return kind
+
+
 def _timeframe_for_chunk(there_are_more_subchunks, chunk_i, window_intersect, index):
     start = None
     end = None
@@ -334,6 +726,12 @@ def _timeframe_for_chunk(there_are_more_subchunks, chunk_i, window_intersect, in
         start = window_intersect.start
         end = window_intersect.end
 
+    if (start is None and end is None and
+            isinstance(index, pd.DatetimeIndex)):
+        # Neither bound comes from the window, so skip the Timestamp
+        # round-trip and read the bounds straight from the int64 index
+        start_ns, end_ns = index.asi8[[0, -1]]
+        return TimeFrame.from_int64_ns(start_ns, end_ns, index.tz)
     if start is None:
         start = index[0]
     if end is None:
@@ -1,3 +1,12 @@
+import re
+
+# Matches 'building<I>', 'building<I>/<utility>',
+# 'building<I>/<utility>/meter<J>' and deeper keys below a utility
+# (e.g. 'building1/elec/cache/meter1'), for which meter is None.
+_KEY_RE = re.compile(
+    r'^building(\d+)(?:/([^/]*)(?:/meter(\d+)|/[^/]*/.*)?)?$')
+
+
 class Key(object):
     """A location of data or metadata within NILMTK.
     
@@ -8,6 +17,8 @@ class Key(object):
     utility : str
     """
 
+    __slots__ = ('building', 'meter', 'utility')
+
     def __init__(self, string=None, building=None, meter=None):
         """
         Parameters
@@ -22,20 +33,14 @@ class Key(object):
             self.building = building
             self.meter = meter
         else:
-            split = string.strip('/').split('/')
-            assert split[0].startswith('building'), "The first element must be 'building<I>', e.g. 'building1'; not '{}'.".format(split[0])
-            try:
-                self.building = int(split[0].replace("building", ""))
-            except ValueError as e:
-                raise ValueError("'building' must be followed by an integer.\n{}"
-                                 .format(e))
-            if len(split) > 1:
-                self.utility = split[1]
-            if len(split) == 3:
-                assert split[2].startswith('meter')
-                self.meter = int(split[-1].replace("meter", ""))
-            else:
-                self.meter = None
+            match = _KEY_RE.match(string.strip('/'))
+            if match is None:
+                raise ValueError("Cannot parse key '{}'.  Keys must look like"
+                                 " 'building<I>/<utility>/meter<J>', e.g."
+                                 " 'building1/elec/meter1'.".format(string))
+            building, self.utility, meter = match.groups()
+            self.building = int(building)
+            self.meter = None if meter is None else int(meter)
         self._check()
 
     def _check(self):
@@ -47,7 +52,6 @@ class Key(object):
 
     def __repr__(self):
         self._check()
-        s = "/building{:d}".format(self.building)
-        if self.meter is not None:
-            s += "/elec/meter{:d}".format(self.meter)
-        return s
+        if self.meter is None:
+            return f"/building{self.building}"
+        return f"/building{self.building}/elec/meter{self.meter}"
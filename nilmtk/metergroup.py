@@ -30,6 +30,7 @@ from .electric import Electric
 from .timeframe import TimeFrame, split_timeframes
 from .preprocessing import Apply
 from .datastore import MAX_MEM_ALLOWANCE_IN_BYTES
+from .datastore.datastore import rows_per_chunk
 from nilmtk.timeframegroup import TimeFrameGroup
 
 # MeterGroupID.meters is a tuple of ElecMeterIDs.  Order doesn't matter.
@@ -664,6 +665,8 @@ class MeterGroup(Electric):
             the maximum number of rows per chunk. Note that each chunk is 
             guaranteed to be of length <= chunksize.  Each chunk is *not*
             guaranteed to be exactly of length == chunksize.
+            If None then uses the same memory budget as
+            `HDFDataStore.load` (see `rows_per_chunk`).
         **kwargs : 
             any other key word arguments to pass to `self.store.load()` including:
         physical_quantity : string or list of strings
@@ -698,10 +701,19 @@ class MeterGroup(Electric):
         sample_period = kwargs.setdefault('sample_period', self.sample_period())
         sections = kwargs.pop('sections', [self.get_timeframe()])
         chunksize = kwargs.pop('chunksize', MAX_MEM_ALLOWANCE_IN_BYTES)
-        duration_threshold = sample_period * chunksize
         columns = pd.MultiIndex.from_tuples(
             self._convert_physical_quantity_and_ac_type_to_cols(**kwargs)['columns'],
             names=LEVEL_NAMES)
+        if chunksize is None:
+            # combine_chunks_from_generators builds a float32 column per
+            # measurement plus an int64 timestamp per row
+            chunksize = rows_per_chunk(8 + 4 * len(columns))
+        duration_threshold = sample_period * chunksize
+
+        # Each section is split below so that it fits in `chunksize` rows.
+        # combine_chunks_from_generators only takes the first chunk from
+        # each meter, so make sure every meter returns the whole section.
+        kwargs['chunksize'] = MAX_MEM_ALLOWANCE_IN_BYTES
         freq = '{:d}S'.format(int(sample_period))
         verbose = kwargs.get('verbose')
 
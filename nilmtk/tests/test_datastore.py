@@ -1,9 +1,14 @@
 import unittest
+import shutil
+import tempfile
 from os.path import join
+import numpy as np
 import pandas as pd
 from datetime import timedelta
 from .testingtools import data_dir
 from nilmtk.datastore import HDFDataStore, CSVDataStore
+from nilmtk.datastore.hdfdatastore import (_to_datetime_index,
+                                           _timeframe_for_chunk)
 from nilmtk import TimeFrame
 
 
@@ -112,6 +117,16 @@ class TestHDFDataStore(unittest.TestCase, SuperTestDataStore):
                              [('power', 'active'), ('energy', 'reactive'),
                               ('voltage', '')])
 
+    def test_elements_below_key(self):
+        self.assertEqual(self.datastore.elements_below_key(), ['building1'])
+        self.assertEqual(self.datastore.elements_below_key('building1/'),
+                         ['elec'])
+        self.assertIn('meter1', self.datastore.elements_below_key('/building1/elec'))
+        for key in ['/building2', '/building1/gas',
+                    '/building1/elec/meter1/table']:
+            with self.assertRaises(KeyError):
+                self.datastore.elements_below_key(key)
+
     def test_n_rows(self):
         self._apply_mask()
         for key in self.keys:
@@ -120,6 +135,64 @@ class TestHDFDataStore(unittest.TestCase, SuperTestDataStore):
             self.datastore.window.enabled = False
             self.assertEqual(self.datastore._nrows(key), self.NROWS)
 
+    def test_n_rows_bounds(self):
+        key = self.keys[0]
+        try:
+            self.datastore.window = TimeFrame(start='2012-01-01 00:10:00')
+            self.assertEqual(self.datastore._nrows(key), self.NROWS - 10*60)
+            self.datastore.window = TimeFrame(end='2012-01-01 00:10:00')
+            self.assertEqual(self.datastore._nrows(key), 10*60)
+            # `end` falls exactly on a row
+            self._apply_mask()
+            self.datastore.window.include_end = True
+            self.assertEqual(self.datastore._nrows(key), 10*60 + 1)
+        finally:
+            self.datastore.window.clear()
+
+    def test_n_rows_tz_aware(self):
+        tmpdir = tempfile.mkdtemp()
+        filename = join(tmpdir, 'tz.h5')
+        key = '/building1/elec/meter1'
+        # British Summer Time, so local time is not UTC
+        index = pd.date_range('2012-07-01', periods=100, freq='S',
+                              tz='Europe/London')
+        data = pd.DataFrame({'power': np.arange(100, dtype=np.float32)},
+                            index=index)
+        data.to_hdf(filename, key, format='table')
+        datastore = HDFDataStore(filename)
+        try:
+            datastore.window = TimeFrame('2012-07-01 00:00:10',
+                                         '2012-07-01 00:00:20',
+                                         tz='Europe/London')
+            self.assertEqual(datastore._nrows(key), 10)
+            datastore.window.include_end = True
+            self.assertEqual(datastore._nrows(key), 11)
+            datastore.window = TimeFrame(start='2012-07-01 00:00:10',
+                                         tz='Europe/London')
+            self.assertEqual(datastore._nrows(key), 90)
+        finally:
+            datastore.close()
+            shutil.rmtree(tmpdir)
+
+    def test_load_window_bounds(self):
+        key = self.keys[0]
+        try:
+            self._apply_mask()
+            self.datastore.window.include_end = True
+            chunks = list(self.datastore.load(key))
+            self.assertEqual(len(chunks), 1)
+            self.assertEqual(len(chunks[0]), 10*60 + 1)
+            self.assertEqual(chunks[0].index[-1], self.datastore.window.end)
+
+            # A window that falls between two rows
+            self.datastore.window = TimeFrame('2012-01-01 00:10:00.2',
+                                              '2012-01-01 00:10:00.8')
+            chunks = list(self.datastore.load(key))
+            self.assertEqual(len(chunks), 1)
+            self.assertTrue(chunks[0].empty)
+        finally:
+            self.datastore.window.clear()
+
     def test_estimate_memory_requirement(self):
         self._apply_mask()
         for key in self.keys:
@@ -130,6 +203,171 @@ class TestHDFDataStore(unittest.TestCase, SuperTestDataStore):
             mem = self.datastore._estimate_memory_requirement(key, self.datastore._nrows(key))
             self.assertEqual(mem, 200000)
 
+    def test_select_matches_hdfstore(self):
+        for key in self.keys:
+            pd.testing.assert_frame_equal(
+                self.datastore._select(key, None, start=10, stop=100),
+                self.datastore.store.select(key, start=10, stop=100))
+
+        # Data columns are stored as scalar fields, not value blocks
+        tmpdir = tempfile.mkdtemp()
+        filename = join(tmpdir, 'data_columns.h5')
+        key = '/building1/elec/meter1'
+        index = pd.date_range(self.START_DATE, periods=200, freq='S')
+        data = pd.DataFrame({'a': np.arange(200, dtype=np.float32),
+                             'b': np.arange(200, dtype=np.int64)},
+                            index=index)
+        data.to_hdf(filename, key, format='table', data_columns=True)
+        datastore = HDFDataStore(filename)
+        try:
+            self.assertIsNone(datastore._get_layout(key, None))
+            pd.testing.assert_frame_equal(
+                datastore._select(key, None, start=10, stop=100),
+                data.iloc[10:100])
+        finally:
+            datastore.close()
+            shutil.rmtree(tmpdir)
+
+        index = pd.date_range('2012-01-01', periods=5, freq='S',
+                              tz='Europe/London', name='foo')
+        converted = _to_datetime_index(index.asi8, index.tz, index.freq,
+                                       index.name)
+        pd.testing.assert_index_equal(converted, index)
+        self.assertEqual(converted.freq, index.freq)
+        # A freq that doesn't fit the values is dropped, as HDFStore does
+        converted = _to_datetime_index(index.asi8[[0, 1, 3]], index.tz,
+                                       index.freq)
+        self.assertIsNone(converted.freq)
+
+    def test_timeframe_for_chunk(self):
+        index = pd.date_range(self.START_DATE, periods=5, freq='S')
+        expected = TimeFrame(index[0], index[-1])
+        window = TimeFrame()
+        self.assertEqual(_timeframe_for_chunk(False, 0, window, index),
+                         expected)
+        # Not a DatetimeIndex, e.g. an object index of Timestamps
+        self.assertEqual(_timeframe_for_chunk(False, 0, window,
+                                              index.astype(object)),
+                         expected)
+
+    def test_writes_invalidate_caches(self):
+        tmpdir = tempfile.mkdtemp()
+        datastore = HDFDataStore(join(tmpdir, 'test.h5'), mode='w')
+        try:
+            key = '/building1/elec/meter1'
+            new_key = '/building1/elec/meter2'
+            columns = pd.MultiIndex.from_tuples([('power', 'active')])
+            index = pd.date_range(self.START_DATE, periods=200, freq='S')
+            data = pd.DataFrame(np.arange(200, dtype=np.float32),
+                                index=index, columns=columns)
+            datastore.put(key, data.iloc[:100])
+
+            def check(key, nrows, end):
+                self.assertIn(key, datastore._keys())
+                self.assertEqual(datastore._nrows(key), nrows)
+                self.assertEqual(datastore.get_timeframe(key).end, end)
+                chunks = list(datastore.load(key))
+                self.assertEqual(len(chunks), 1)
+                self.assertEqual(len(chunks[0]), nrows)
+                self.assertEqual(chunks[0].index[-1], end)
+
+            # Fill the caches
+            check(key, 100, index[99])
+            self.assertEqual(datastore.elements_below_key('/building1/elec'),
+                             ['meter1'])
+
+            datastore.put(new_key, data.iloc[:50])
+            check(new_key, 50, index[49])
+            self.assertEqual(
+                sorted(datastore.elements_below_key('/building1/elec')),
+                ['meter1', 'meter2'])
+
+            check(key, 100, index[99])
+            datastore.append(key, data.iloc[100:])
+            check(key, 200, index[199])
+
+            datastore.remove(new_key)
+            self.assertNotIn(new_key, datastore._keys())
+            self.assertEqual(datastore.elements_below_key('/building1/elec'),
+                             ['meter1'])
+            with self.assertRaises(KeyError):
+                next(datastore.load(new_key))
+        finally:
+            datastore.close()
+            shutil.rmtree(tmpdir)
+
+    def test_load_many(self):
+        self.datastore.window.clear()
+        loaded = list(self.datastore.load_many(self.keys, chunksize=3000))
+        expected = [(key, chunk) for key in self.keys
+                    for chunk in self.datastore.load(key, chunksize=3000)]
+        self.assertEqual(len(loaded), len(expected))
+        for (key, chunk), (expected_key, expected_chunk) in zip(loaded, expected):
+            self.assertEqual(key, expected_key)
+            pd.testing.assert_frame_equal(chunk, expected_chunk)
+            self.assertEqual(chunk.timeframe, expected_chunk.timeframe)
+
+        # Stopping early must not leave the reader thread blocked
+        gen = self.datastore.load_many(self.keys, chunksize=100, prefetch=1)
+        next(gen)
+        gen.close()
+
+        with self.assertRaises(KeyError):
+            list(self.datastore.load_many(['/building1/elec/meter99']))
+
+    def test_load_releases_read_buffer(self):
+        self.datastore.window.clear()
+        list(self.datastore.load(self.keys[0], chunksize=3000))
+        self.assertEqual(self.datastore._buf_pool, {})
+
+        gen = self.datastore.load(self.keys[0], chunksize=3000)
+        next(gen)
+        self.assertNotEqual(self.datastore._buf_pool, {})
+        gen.close()
+        self.assertEqual(self.datastore._buf_pool, {})
+
+    def test_open_close(self):
+        self.datastore.window.clear()
+        self.datastore.get_timeframe(self.keys[0])
+
+        # A nested open/close pair must leave the file open
+        self.datastore.open()
+        self.datastore.close()
+        self.assertTrue(self.datastore.store.is_open)
+
+        # Reopening after the last close must not reuse stale handles
+        self.datastore.close()
+        self.assertFalse(self.datastore.store.is_open)
+        self.datastore.open()
+        self.assertEqual(self.datastore.get_timeframe(self.keys[0]), self.TIMEFRAME)
+        self.assertEqual(len(next(self.datastore.load(self.keys[0]))), self.NROWS)
+
+    def test_open_changes_write_permission(self):
+        tmpdir = tempfile.mkdtemp()
+        filename = join(tmpdir, 'random.h5')
+        shutil.copy(join(data_dir(), 'random.h5'), filename)
+        datastore = HDFDataStore(filename, mode='r')
+        try:
+            datastore.open(mode='r+')
+            self.assertEqual(datastore.store._handle.mode, 'r+')
+            self.assertEqual(datastore.get_timeframe(self.keys[0]), self.TIMEFRAME)
+            datastore.close()
+            self.assertTrue(datastore.store.is_open)
+            datastore.close()
+            self.assertFalse(datastore.store.is_open)
+
+            # A read-only open() inside a writable one keeps write access
+            datastore.open(mode='a')
+            datastore.open(mode='r')
+            self.assertEqual(datastore.store._handle.mode, 'a')
+            datastore.close()
+            self.assertEqual(datastore.store._handle.mode, 'a')
+            datastore.close()
+            self.assertFalse(datastore.store.is_open)
+        finally:
+            datastore.store.close()
+            shutil.rmtree(tmpdir)
+
 class TestCSVDataStore(unittest.TestCase, SuperTestDataStore):
 
     @classmethod
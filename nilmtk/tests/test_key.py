@@ -0,0 +1,36 @@
+import unittest
+from nilmtk.datastore import Key
+
+
+class TestKey(unittest.TestCase):
+    def _assert_key(self, string, building, utility, meter):
+        key = Key(string)
+        self.assertEqual(key.building, building)
+        self.assertEqual(key.utility, utility)
+        self.assertEqual(key.meter, meter)
+
+    def test_parse(self):
+        self._assert_key('building1', 1, None, None)
+        self._assert_key('/building12/', 12, None, None)
+        self._assert_key('building1/elec', 1, 'elec', None)
+        self._assert_key('building1/elec/meter1', 1, 'elec', 1)
+        self._assert_key('/building1/elec/meter23', 1, 'elec', 23)
+        self._assert_key('building1//meter1', 1, '', 1)
+        # Anything deeper than a meter (e.g. cached stats) has no meter
+        self._assert_key('building1/elec/cache/meter1', 1, 'elec', None)
+
+    def test_parse_errors(self):
+        for string in ['buildingX', 'building', 'building1/elec/meterX',
+                       'building1/elec/cache', 'foo/elec/meter1']:
+            with self.assertRaises(ValueError):
+                Key(string)
+
+    def test_repr(self):
+        self.assertEqual(str(Key('building1/elec/meter2')),
+                         '/building1/elec/meter2')
+        self.assertEqual(str(Key(building=3)), '/building3')
+        self.assertEqual(str(Key(building=3, meter=4)), '/building3/elec/meter4')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,13 @@
 import unittest
+from unittest import mock
 from os.path import join
+import pandas as pd
 from nilmtk.tests.testingtools import data_dir
 from nilmtk import (Appliance, MeterGroup, ElecMeter, HDFDataStore, 
                     global_meter_group, TimeFrame, DataSet)
 from nilmtk.utils import tree_root, nodes_adjacent_to_root
 from nilmtk.elecmeter import ElecMeterID
+from nilmtk.electric import align_two_meters
 from nilmtk.building import BuildingID
 
 class TestMeterGroup(unittest.TestCase):
@@ -144,7 +147,48 @@ class TestMeterGroup(unittest.TestCase):
         self.assertEqual(df.columns.levels, [['energy'], ['reactive']])
         df = next(elec.load(ac_type='active'))
         self.assertEqual(df.columns.levels, [['power'], ['active']])
+
+    def test_load_longer_than_default_chunksize(self):
+        filename = join(data_dir(), 'random.h5')
+        ds = DataSet(filename)
+        elec = ds.buildings[1].elec
+        expected = pd.concat(elec.load(physical_quantity='power'))
+
+        # Shrink the memory budget so that each 10000-row table is longer
+        # than the chunksize picked by chunksize=None
+        with _small_memory_budget():
+            self.assertLess(ds.store._default_chunksize('/building1/elec/meter1'),
+                            10000)
+            chunks = list(elec.load(physical_quantity='power', chunksize=None))
+            # By default each section still comes back as a single chunk
+            self.assertEqual(len(next(elec.meters[0].load())), 10000)
+        ds.store.close()
+
+        self.assertGreater(len(chunks), 1)
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+        self.assertFalse(expected.isnull().values.any())
+
+    def test_align_two_meters_with_small_memory_budget(self):
+        filename = join(data_dir(), 'random.h5')
+        ds = DataSet(filename)
+        master, slave = ds.buildings[1].elec.meters[:2]
+        sections = [master.get_timeframe()]
+        with _small_memory_budget(), \
+             mock.patch.object(master, 'good_sections', return_value=sections):
+            aligned = list(align_two_meters(master, slave))
+        ds.store.close()
+
+        # One 10000-row section at 1 Hz, resampled to the 10 s sample period
+        self.assertEqual(len(aligned), 1)
+        self.assertEqual(len(aligned[0]), 1000)
+        self.assertFalse(aligned[0].isnull().values.any())
         
 
+def _small_memory_budget():
+    return mock.patch.multiple('nilmtk.datastore.datastore',
+                               MAX_MEM_ALLOWANCE_IN_BYTES=2**14,
+                               MIN_CHUNKSIZE=100)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -25,6 +25,18 @@ class TestTimeFrame(unittest.TestCase):
         with self.assertRaises(ValueError):
             tf.start = "2012-01-01"
 
+    def test_from_int64_ns(self):
+        index = pd.date_range('2012-01-01', periods=3, freq='S',
+                              tz='Europe/London')
+        tf = TimeFrame.from_int64_ns(index.asi8[0], index.asi8[-1], index.tz)
+        self.assertEqual(tf, TimeFrame(index[0], index[-1]))
+        self.assertEqual(tf.start.tz.zone, 'Europe/London')
+
+        # Setting one bound must keep the other
+        tf = TimeFrame.from_int64_ns(index.asi8[0], index.asi8[-1])
+        tf.start = None
+        self.assertEqual(tf.end, index[-1].tz_localize(None))
+
     def test_time_delta(self):
         tf = TimeFrame("2012-01-01 00:00:00", "2013-01-01 00:00:00")
         self.assertAlmostEqual(tf.timedelta.total_seconds(), 60*60*24*366)
@@ -24,8 +24,13 @@ class TimeFrame(object):
     _empty : boolean
         If True then represents an empty time frame
     include_end : boolean
+    _ns : tuple or None
+        (start_ns, end_ns, tz) not yet converted to _start and _end.
+        See `from_int64_ns`.
     """
 
+    _ns = None
+
     def __init__(self, start=None, end=None, tz=None):
         self.clear()
         if isinstance(start, TimeFrame):
@@ -49,6 +54,7 @@ class TimeFrame(object):
         self._start = None
         self._end = None
         self._empty = False
+        self._ns = None
 
     @classmethod
     def from_dict(cls, d):
@@ -59,14 +65,37 @@ class TimeFrame(object):
         end = key_to_timestamp('end')
         return cls(start, end)
 
+    @classmethod
+    def from_int64_ns(cls, start_ns, end_ns, tz=None):
+        """Builds a TimeFrame from int64 nanoseconds since the epoch
+        (UTC if `tz` is set), as found in `DatetimeIndex.asi8`.
+        The Timestamps are only created when `start` or `end` is
+        first accessed.  Unlike the constructor, does not check that
+        `start_ns < end_ns`."""
+        timeframe = cls.__new__(cls)
+        timeframe.clear()
+        timeframe.include_end = False
+        timeframe._ns = (start_ns, end_ns, tz)
+        return timeframe
+
+    def _materialise(self):
+        start_ns, end_ns, tz = self._ns
+        self._ns = None
+        self._start = pd.Timestamp(start_ns, tz=tz)
+        self._end = pd.Timestamp(end_ns, tz=tz)
+
     @property
     def start(self):
         if self.enabled:
+            if self._ns is not None:
+                self._materialise()
             return self._start
 
     @property
     def end(self):
         if self.enabled:
+            if self._ns is not None:
+                self._materialise()
             return self._end
 
     @property
@@ -75,6 +104,8 @@ class TimeFrame(object):
 
     @start.setter
     def start(self, new_start):
+        if self._ns is not None:
+            self._materialise()
         new_start = convert_nat_to_none(new_start)
         if new_start is None:
             self._start = None
@@ -87,6 +118,8 @@ class TimeFrame(object):
 
     @end.setter
     def end(self, new_end):
+        if self._ns is not None:
+            self._materialise()
         new_end = convert_nat_to_none(new_end)
         if new_end is None:
             self._end = None